@@ -1,15 +1,44 @@
 # config.py
 # ---------------------------------------------------------
 # Global Configuration for Smart Parking IoT System
+# Defaults below can be overridden per deployment, without a code
+# edit, by a JSON file (path in PARKING_CONFIG, default
+# "parking_config.json" next to this file) and by PARKING_<NAME>
+# environment variables. Precedence: environment > file > default.
 # ---------------------------------------------------------
+import json
+import os
+from typing import Any
+
+ENV_PREFIX: str = "PARKING_"
+# Default resolved against the project dir so the CWD doesn't matter
+CONFIG_FILE: str = os.environ.get(
+    ENV_PREFIX + "CONFIG", os.path.join(os.path.dirname(os.path.abspath(__file__)), "parking_config.json"))
+
+
+def _load_file(path: str) -> dict[str, Any]:
+    if not os.path.isfile(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+_file_settings: dict[str, Any] = _load_file(CONFIG_FILE)
+
+
+def _setting(name: str, default: Any) -> Any:
+    """Resolves one setting, cast to the type of its default."""
+    raw = os.environ.get(ENV_PREFIX + name, _file_settings.get(name, default))
+    return type(default)(raw)
+
 
 # MQTT Broker Settings
-BROKER_ADDRESS: str = "broker.hivemq.com"
-BROKER_PORT: int = 1883
-KEEPALIVE: int = 60
+BROKER_ADDRESS: str = _setting("BROKER_ADDRESS", "broker.hivemq.com")
+BROKER_PORT: int = _setting("BROKER_PORT", 1883)
+KEEPALIVE: int = _setting("KEEPALIVE", 60)
 
 # Topic Structure & Isolation
-UNIQUE_ID: str = "Meir_Final_Project_2026"
+UNIQUE_ID: str = _setting("UNIQUE_ID", "Meir_Final_Project_2026")
 TOPIC_ROOT: str = f"SmartCity/Parking/{UNIQUE_ID}/"
 
 # Sensors (Producers - Information Flow)
@@ -28,9 +57,26 @@ TOPIC_SIGNAGE: str = TOPIC_ROOT + "Signage/Text"         # Display: FREE/FULL
 TOPIC_ALERTS: str = TOPIC_ROOT + "System/Alerts"
 
 # Database Configuration
-DB_NAME: str = "smart_parking.db"
+DB_NAME: str = _setting("DB_NAME", "smart_parking.db")
 TABLE_LOGS: str = "system_logs"
+TABLE_SLOT_EVENTS: str = "slot_events"
+SLOT_EVENT_BATCH_SIZE: int = _setting("SLOT_EVENT_BATCH_SIZE", 50)  # Flush buffered transitions at this size
+ANALYTICS_CHUNK_SIZE: int = _setting("ANALYTICS_CHUNK_SIZE", 100_000)  # Rows per chunk when loading analytics
+TIMEZONE: str = _setting("TIMEZONE", "Asia/Jerusalem")  # Lot's local zone for hour/day bucketing
+
+# History View (read-only pooled queries)
+HISTORY_POOL_SIZE: int = _setting("HISTORY_POOL_SIZE", 4)     # Read-only connections / worker threads
+HISTORY_PAGE_SIZE: int = _setting("HISTORY_PAGE_SIZE", 100)   # Rows per keyset page
+HISTORY_CACHE_PAGES: int = _setting("HISTORY_CACHE_PAGES", 32)  # Recently viewed pages kept in memory
+
+# Shared-Memory Occupancy Board (co-located processes)
+SHM_BOARD_NAME: str = _setting("SHM_BOARD_NAME", "smart_parking_board")
+SHM_POLL_INTERVAL: int = _setting("SHM_POLL_INTERVAL", 200)  # milliseconds
+SHM_HEARTBEAT_TIMEOUT: int = _setting("SHM_HEARTBEAT_TIMEOUT", 5)  # seconds without a heartbeat = writer gone
+
+# Debug Logging (0 = silent, icecream is never imported by the core)
+LOG_ENABLED: int = _setting("LOG_ENABLED", 1)
 
 # Logic Constants
-TOTAL_SLOTS: int = 4
-GATE_OPEN_DURATION: int = 3000  # milliseconds
\ No newline at end of file
+TOTAL_SLOTS: int = _setting("TOTAL_SLOTS", 4)
+GATE_OPEN_DURATION: int = _setting("GATE_OPEN_DURATION", 3000)  # milliseconds
\ No newline at end of file
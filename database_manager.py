@@ -3,14 +3,27 @@
 # SQLite Database Manager
 # Implements WAL Mode for high concurrency and stability.
 # ---------------------------------------------------------
+import queue
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from config import DB_NAME, TABLE_LOGS
-from icecream import ic
+from typing import Optional
+from config import (DB_NAME, TABLE_LOGS, TABLE_SLOT_EVENTS, SLOT_EVENT_BATCH_SIZE,
+                    HISTORY_POOL_SIZE, HISTORY_PAGE_SIZE, HISTORY_CACHE_PAGES)
+from debug_log import ic
 
 class DatabaseManager:
-    def __init__(self):
-        self.init_db()
+    def __init__(self, auto_init: bool = True):
+        # Slot transitions are buffered and written in batches
+        self._slot_events: list[tuple[int, int, int]] = []
+        self._slot_events_lock = threading.Lock()
+        # Serialises whole flushes so batches commit (and get ids) in order
+        self._flush_lock = threading.Lock()
+        # Callers may defer init_db() (e.g. to overlap it with the MQTT connect)
+        if auto_init:
+            self.init_db()
 
     def get_connection(self) -> sqlite3.Connection:
         """Creates a connection and enables Write-Ahead Logging (WAL)."""
@@ -23,7 +36,7 @@ class DatabaseManager:
             return None
 
     def init_db(self) -> None:
-        """Initializes the logs table schema."""
+        """Initializes the logs and slot events table schemas."""
         sql_create_table = f"""
             CREATE TABLE IF NOT EXISTS {TABLE_LOGS} (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -33,11 +46,27 @@ class DatabaseManager:
                 event_type TEXT
             );
         """
+        # Compact integer-only rows: slot id, state (1 = occupied), epoch seconds
+        sql_create_events = f"""
+            CREATE TABLE IF NOT EXISTS {TABLE_SLOT_EVENTS} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                slot_id INTEGER NOT NULL,
+                state INTEGER NOT NULL,
+                ts INTEGER NOT NULL
+            );
+        """
         conn = self.get_connection()
         if conn:
             try:
                 cursor = conn.cursor()
                 cursor.execute(sql_create_table)
+                cursor.execute(sql_create_events)
+                # Latest state per slot (Manager restart)
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{TABLE_SLOT_EVENTS}_slot_id "
+                               f"ON {TABLE_SLOT_EVENTS}(slot_id, id);")
+                # Supports keyset pagination filtered by event type
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{TABLE_LOGS}_type_id "
+                               f"ON {TABLE_LOGS}(event_type, id);")
                 conn.commit()
                 ic("Database initialized successfully (WAL Mode Enabled).")
             except sqlite3.Error as e:
@@ -60,4 +89,153 @@ class DatabaseManager:
             except sqlite3.Error as e:
                 ic(f"Insert Error: {e}")
             finally:
-                conn.close()
\ No newline at end of file
+                conn.close()
+
+    def log_slot_event(self, slot_id: int, state: int) -> None:
+        """Buffers a slot transition; flushes once the batch is full."""
+        with self._slot_events_lock:
+            self._slot_events.append((slot_id, state, int(time.time())))
+            batch_full = len(self._slot_events) >= SLOT_EVENT_BATCH_SIZE
+        if batch_full:
+            self.flush_slot_events()
+
+    def last_slot_states(self) -> dict[int, int]:
+        """Returns the most recently logged state of every slot."""
+        # SQLite takes bare columns from the row holding MAX(id)
+        sql = f"SELECT slot_id, state, MAX(id) FROM {TABLE_SLOT_EVENTS} GROUP BY slot_id"
+        conn = self.get_connection()
+        if not conn:
+            return {}
+        try:
+            return {slot_id: state for slot_id, state, _ in conn.execute(sql)}
+        except sqlite3.Error as e:
+            ic(f"Slot State Query Error: {e}")
+            return {}
+        finally:
+            conn.close()
+
+    def flush_slot_events(self) -> None:
+        """Writes all buffered slot transitions in a single transaction."""
+        with self._flush_lock:
+            with self._slot_events_lock:
+                batch, self._slot_events = self._slot_events, []
+            if not batch:
+                return
+
+            sql = f''' INSERT INTO {TABLE_SLOT_EVENTS}(slot_id, state, ts)
+                       VALUES(?,?,?) '''
+            conn = self.get_connection()
+            if conn:
+                try:
+                    conn.executemany(sql, batch)
+                    conn.commit()
+                except sqlite3.Error as e:
+                    ic(f"Slot Events Insert Error: {e}")
+                finally:
+                    conn.close()
+
+LogRow = tuple[int, str, str, str, Optional[str]]  # id, timestamp, topic, message, event_type
+
+
+class ReadOnlyConnectionPool:
+    """
+    Fixed-size pool of read-only connections for background readers.
+    WAL lets them run alongside the Manager's writes without locking.
+    """
+    def __init__(self, size: int = HISTORY_POOL_SIZE, db_name: str = DB_NAME):
+        self.db_name: str = db_name
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._slots = threading.Semaphore(size)
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(f"file:{self.db_name}?mode=ro", uri=True,
+                               check_same_thread=False, cached_statements=32)
+        conn.execute("PRAGMA query_only=ON;")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Blocks until a connection is free; opens one lazily if needed."""
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            try:
+                return self._open()
+            except sqlite3.Error:
+                self._slots.release()
+                raise
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        self._idle.put(conn)
+        self._slots.release()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class LogHistoryReader:
+    """
+    Keyset-paginated, thread-safe queries over the system logs.
+    Pages are keyed by the id they start below, so once fetched they never
+    change (logs are append-only) and can be cached.
+    """
+    # Constant SQL text so each pooled connection reuses its prepared statements
+    SQL_PAGE = f''' SELECT id, timestamp, topic, message, event_type FROM {TABLE_LOGS}
+                    WHERE id < ? ORDER BY id DESC LIMIT ? '''
+    SQL_PAGE_BY_TYPE = f''' SELECT id, timestamp, topic, message, event_type FROM {TABLE_LOGS}
+                            WHERE event_type = ? AND id < ? ORDER BY id DESC LIMIT ? '''
+    SQL_EVENT_TYPES = f''' SELECT DISTINCT event_type FROM {TABLE_LOGS}
+                           WHERE event_type IS NOT NULL ORDER BY event_type '''
+
+    def __init__(self, pool: Optional[ReadOnlyConnectionPool] = None,
+                 page_size: int = HISTORY_PAGE_SIZE, cache_pages: int = HISTORY_CACHE_PAGES):
+        self.pool = pool or ReadOnlyConnectionPool()
+        self.page_size: int = page_size
+        self.cache_pages: int = cache_pages
+        self._cache: OrderedDict[tuple[Optional[str], int], list[LogRow]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def fetch_page(self, before_id: Optional[int] = None,
+                   event_type: Optional[str] = None) -> list[LogRow]:
+        """Returns up to page_size rows older than before_id (newest first)."""
+        key = (event_type, before_id)
+        if before_id is not None:
+            with self._cache_lock:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    return self._cache[key]
+
+        upper = before_id if before_id is not None else 2**63 - 1
+        if event_type:
+            rows = self._query(self.SQL_PAGE_BY_TYPE, (event_type, upper, self.page_size))
+        else:
+            rows = self._query(self.SQL_PAGE, (upper, self.page_size))
+
+        # The newest page keeps growing, so only pages below a known id are cached
+        if before_id is not None and rows:
+            with self._cache_lock:
+                self._cache[key] = rows
+                if len(self._cache) > self.cache_pages:
+                    self._cache.popitem(last=False)
+        return rows
+
+    def event_types(self) -> list[str]:
+        return [row[0] for row in self._query(self.SQL_EVENT_TYPES)]
+
+    def _query(self, sql: str, params: tuple = ()) -> list:
+        try:
+            conn = self.pool.acquire()
+        except sqlite3.Error as e:  # DB not created yet (Manager never ran)
+            ic(f"History Connection Error: {e}")
+            return []
+        try:
+            return conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            ic(f"History Query Error: {e}")
+            return []
+        finally:
+            self.pool.release(conn)
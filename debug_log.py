@@ -0,0 +1,30 @@
+# debug_log.py
+# ---------------------------------------------------------
+# Lazy Debug Logging for the Headless Core
+# icecream is the largest import of the controller, so it is only
+# loaded on the first log call (or never, with LOG_ENABLED=0).
+# ---------------------------------------------------------
+from datetime import datetime
+from typing import Any
+from config import LOG_ENABLED
+
+_ic: Any = None
+
+
+def _load() -> Any:
+    global _ic
+    if _ic is None:
+        from icecream import ic as real
+        real.configureOutput(prefix=lambda: f'{datetime.now().strftime("%H:%M:%S")} | ')
+        _ic = real
+    return _ic
+
+
+def ic(*args: Any) -> Any:
+    """Drop-in for the project's ic(...) calls, using icecream's output settings."""
+    if LOG_ENABLED:
+        real = _load()
+        if real.enabled:
+            prefix = real.prefix() if callable(real.prefix) else real.prefix
+            real.outputFunction(prefix + ", ".join(real.argToStringFunction(a) for a in args))
+    return args[0] if len(args) == 1 else (args or None)
@@ -0,0 +1,167 @@
+# history_panel.py
+# ---------------------------------------------------------
+# Historical Log Viewer (Dashboard Panel)
+# Lazily pages through system_logs on a background thread pool
+# so scrolling back never blocks the Qt (GUI) thread.
+# ---------------------------------------------------------
+from typing import Any, Optional
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QComboBox,
+                             QListView, QPushButton, QLabel)
+from PyQt5.QtCore import (Qt, QObject, QRunnable, QThreadPool, QAbstractListModel,
+                          QModelIndex, pyqtSignal)
+from database_manager import LogHistoryReader, LogRow
+from config import HISTORY_POOL_SIZE
+
+ALL_EVENTS: str = "All Events"
+
+
+class LoaderSignals(QObject):
+    # QRunnable is not a QObject, so loaders borrow these signals
+    page_loaded = pyqtSignal(int, list)  # generation, rows
+    types_loaded = pyqtSignal(list)
+
+
+class PageLoader(QRunnable):
+    """Fetches one keyset page on a pool thread."""
+    def __init__(self, reader: LogHistoryReader, generation: int,
+                 before_id: Optional[int], event_type: Optional[str]):
+        super().__init__()
+        self.reader = reader
+        self.generation: int = generation
+        self.before_id: Optional[int] = before_id
+        self.event_type: Optional[str] = event_type
+        self.signals = LoaderSignals()
+
+    def run(self) -> None:
+        rows = self.reader.fetch_page(self.before_id, self.event_type)
+        self.signals.page_loaded.emit(self.generation, rows)
+
+
+class TypesLoader(QRunnable):
+    """Fetches the distinct event types for the filter box on a pool thread."""
+    def __init__(self, reader: LogHistoryReader):
+        super().__init__()
+        self.reader = reader
+        self.signals = LoaderSignals()
+
+    def run(self) -> None:
+        self.signals.types_loaded.emit(self.reader.event_types())
+
+
+class LogHistoryModel(QAbstractListModel):
+    """
+    List model that fetches older pages on demand as the view scrolls.
+    Changing the filter bumps the generation so late pages are discarded.
+    """
+    def __init__(self, reader: LogHistoryReader, thread_pool: QThreadPool):
+        super().__init__()
+        self.reader = reader
+        self.thread_pool = thread_pool
+        self.rows: list[LogRow] = []
+        self.event_type: Optional[str] = None
+        self.generation: int = 0
+        self.loading: bool = False
+        self.has_more: bool = True
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        _, timestamp, topic, message, event_type = self.rows[index.row()]
+        return f"[{timestamp}] {event_type or 'INFO'}: {message}  ({topic.split('/')[-1]})"
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and self.has_more and not self.loading
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if not self.canFetchMore(parent):
+            return
+        self.loading = True
+        before_id = self.rows[-1][0] if self.rows else None
+        loader = PageLoader(self.reader, self.generation, before_id, self.event_type)
+        loader.signals.page_loaded.connect(self.on_page_loaded)
+        self.thread_pool.start(loader)
+
+    def on_page_loaded(self, generation: int, rows: list) -> None:
+        """Runs on the GUI thread (queued signal)."""
+        if generation != self.generation:
+            return
+        self.loading = False
+        self.has_more = len(rows) >= self.reader.page_size
+        if rows:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(rows) - 1)
+            self.rows.extend(rows)
+            self.endInsertRows()
+
+    def reset(self, event_type: Optional[str] = None) -> None:
+        """Restarts paging from the newest log (used for filter and refresh)."""
+        self.beginResetModel()
+        self.generation += 1
+        self.event_type = event_type
+        self.rows = []
+        self.loading = False
+        self.has_more = True
+        self.endResetModel()
+        self.fetchMore()
+
+
+class HistoryPanel(QWidget):
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.reader = LogHistoryReader()
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(HISTORY_POOL_SIZE)
+        self.model = LogHistoryModel(self.reader, self.thread_pool)
+
+        self.init_ui()
+        self.refresh()
+
+    def init_ui(self) -> None:
+        layout = QVBoxLayout()
+
+        # 1. Filter Bar
+        bar = QHBoxLayout()
+        bar.addWidget(QLabel("Event Type:"))
+        self.combo_type = QComboBox()
+        self.combo_type.addItem(ALL_EVENTS)
+        self.combo_type.currentTextChanged.connect(self.apply_filter)
+        bar.addWidget(self.combo_type, 1)
+        btn_refresh = QPushButton("Refresh")
+        btn_refresh.clicked.connect(self.refresh)
+        bar.addWidget(btn_refresh)
+        layout.addLayout(bar)
+
+        # 2. Lazily Loaded List
+        self.list_history = QListView()
+        self.list_history.setModel(self.model)
+        self.list_history.setUniformItemSizes(True)
+        self.list_history.setStyleSheet("background-color: #2b2b2b; color: #E0E0E0; font-family: Consolas;")
+        layout.addWidget(self.list_history)
+
+        self.setLayout(layout)
+
+    def apply_filter(self, text: str) -> None:
+        self.model.reset(None if text == ALL_EVENTS else text)
+
+    def refresh(self) -> None:
+        """Reloads event types (in the background) and the newest page."""
+        loader = TypesLoader(self.reader)
+        loader.signals.types_loaded.connect(self.on_types_loaded)
+        self.thread_pool.start(loader)
+        self.model.reset(self.model.event_type)
+
+    def on_types_loaded(self, types: list) -> None:
+        current = self.combo_type.currentText()
+        self.combo_type.blockSignals(True)
+        self.combo_type.clear()
+        self.combo_type.addItems([ALL_EVENTS] + types)
+        self.combo_type.setCurrentText(current if current in types else ALL_EVENTS)
+        self.combo_type.blockSignals(False)
+        if self.combo_type.currentText() != current:
+            self.apply_filter(self.combo_type.currentText())
+
+    def shutdown(self) -> None:
+        self.thread_pool.waitForDone()
+        self.reader.pool.close()
@@ -3,22 +3,33 @@
 # Business Logic Controller (The "Manager")
 # Coordinates Sensors, Actuators, and Database.
 # ---------------------------------------------------------
+# Headless: imports no GUI (PyQt5) or analytics (pandas) modules,
+# and icecream only loads on the first log line (see debug_log.py).
+import threading
 import time
 from mqtt_client import MqttClient
 from database_manager import DatabaseManager
-from config import *
-from icecream import ic
+from shared_state import OccupancyBoardWriter
+from config import (TOTAL_SLOTS, TOPIC_SLOT_STATUS, TOPIC_SLOT_BASE, TOPIC_ENTRY_BUTTON,
+                    TOPIC_GATE_COMMAND, TOPIC_GATE_FEEDBACK, TOPIC_SIGNAGE, TOPIC_ALERTS)
+from debug_log import ic
 
 class ParkingManager:
     def __init__(self):
         self.client_id: str = "Manager_App_v1"
         self.mqtt = MqttClient(self.client_id)
-        self.db = DatabaseManager()
-        
+        # Schema setup is deferred to boot() so it overlaps the broker connect
+        self.db = DatabaseManager(auto_init=False)
+        self.db_ready = threading.Event()
+
         # State Tracking
         self.slots_status: dict[int, int] = {i: 0 for i in range(1, TOTAL_SLOTS + 1)}
         self.occupied_count: int = 0
 
+        # Authoritative state for local readers (Dashboard, tools).
+        # Stays "unknown" until init_db() seeds the last recorded slot states.
+        self.board = OccupancyBoardWriter(TOTAL_SLOTS)
+
     def on_connect_success(self):
         ic("Connected! Subscribing now...")
         self.mqtt.subscribe(TOPIC_SLOT_STATUS)
@@ -26,22 +37,52 @@ class ParkingManager:
         self.mqtt.subscribe(TOPIC_GATE_COMMAND)
         self.mqtt.subscribe(TOPIC_GATE_FEEDBACK)
 
-    def start(self) -> None:
-        """Main entry point."""
+    def init_db(self) -> None:
+        try:
+            self.db.init_db()
+            # Sensors only publish on change, so resume from the last logged
+            # transitions instead of assuming every slot is free.
+            for slot_id, state in self.db.last_slot_states().items():
+                if slot_id in self.slots_status:
+                    self.slots_status[slot_id] = state
+            self.occupied_count = sum(self.slots_status.values())
+            self.board.publish(self.slots_status, self.occupied_count)
+        finally:
+            # Never leave process_message() waiting forever on a failed init
+            self.db_ready.set()
+
+    def boot(self, connect: bool = True) -> None:
+        """Runs DB initialisation in parallel with the MQTT connect."""
+        # Own thread: a slow broker connect must not make the board look dead
+        self.board.start_heartbeat()
+        db_thread = threading.Thread(target=self.init_db, name="DB_Init", daemon=True)
+        db_thread.start()
+
         self.mqtt.on_connected_callback = self.on_connect_success
-        self.mqtt.connect()
         self.mqtt.on_msg_received = self.process_message
+        if connect:
+            self.mqtt.connect()
+        db_thread.join()
+
+    def start(self) -> None:
+        """Main entry point."""
+        self.boot()
         
         ic("Parking Manager Running... (Press Ctrl+C to stop)")
         try:
             while True:
                 time.sleep(1) # Keep main thread alive
+                self.db.flush_slot_events()
         except KeyboardInterrupt:
             self.mqtt.disconnect()
+            self.db.flush_slot_events()
+            self.board.close()
             ic("Manager Stopped.")
 
     def process_message(self, topic: str, payload: str) -> None:
         """Routing logic for incoming MQTT messages."""
+        # Messages can arrive while the schema is still being created
+        self.db_ready.wait()
         
         # 1. Sensor Data (Slots)
         if topic.startswith(TOPIC_SLOT_BASE):
@@ -50,7 +91,9 @@ class ParkingManager:
                 slot_id = int(topic.split("/")[-2])
                 status = int(payload)
                 
-                # Logic Update
+                # Logic Update (persist transitions only)
+                if self.slots_status.get(slot_id) != status:
+                    self.db.log_slot_event(slot_id, status)
                 self.slots_status[slot_id] = status
                 self.update_occupancy()
                 
@@ -69,6 +112,7 @@ class ParkingManager:
     def update_occupancy(self) -> None:
         """Recalculate occupancy and update signage."""
         self.occupied_count = sum(self.slots_status.values())
+        self.board.publish(self.slots_status, self.occupied_count)
         ic(f"Occupancy Updated: {self.occupied_count}/{TOTAL_SLOTS}")
         
         # Business Logic: Signage Control
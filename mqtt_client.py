@@ -7,10 +7,7 @@ from typing import Callable, Optional, Any
 from paho.mqtt.enums import CallbackAPIVersion
 import paho.mqtt.client as mqtt
 from config import BROKER_ADDRESS, BROKER_PORT, KEEPALIVE
-from icecream import ic
-from datetime import datetime
-
-ic.configureOutput(prefix=lambda: f'{datetime.now().strftime("%H:%M:%S")} | ')
+from debug_log import ic
 
 class MqttClient:
     """
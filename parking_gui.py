@@ -5,23 +5,28 @@
 # ---------------------------------------------------------
 import sys
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QGridLayout, 
-                             QLabel, QListWidget, QVBoxLayout, QFrame)
+                             QLabel, QListWidget, QVBoxLayout, QFrame, QTabWidget)
 from PyQt5.QtCore import pyqtSignal, QObject, Qt, QTimer
 from mqtt_client import MqttClient
+from shared_state import OccupancyBoardReader
+from history_panel import HistoryPanel
 from config import *
 import datetime
+from typing import Optional
 from icecream import ic
 
 class MqttWorker(QObject):
     msg_signal = pyqtSignal(str, str)
     def on_connect_success(self):
         ic("GUI Connected! Subscribing to data...")
-        self.client.subscribe(TOPIC_SLOT_STATUS)
+        if self.subscribe_slots:
+            self.client.subscribe(TOPIC_SLOT_STATUS)
         self.client.subscribe(TOPIC_ALERTS)
         self.client.subscribe(TOPIC_SIGNAGE)
         self.client.subscribe(TOPIC_GATE_COMMAND)
-    def __init__(self):
+    def __init__(self, subscribe_slots: bool = True):
         super().__init__()
+        self.subscribe_slots: bool = subscribe_slots
         self.client = MqttClient("GUI_Dashboard_Viewer")
 
         self.client.on_connected_callback = self.on_connect_success
@@ -31,6 +36,13 @@ class MqttWorker(QObject):
     def emit_msg(self, topic: str, payload: str) -> None:
         self.msg_signal.emit(topic, payload)
 
+    def subscribe_slot_topics(self) -> None:
+        """Switches slot updates back to MQTT (shared board unavailable)."""
+        if not self.subscribe_slots:
+            self.subscribe_slots = True
+            if self.client.connected:
+                self.client.subscribe(TOPIC_SLOT_STATUS)
+
 class ParkingDashboard(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -38,11 +50,25 @@ class ParkingDashboard(QMainWindow):
         self.setGeometry(600, 100, 600, 500)
         
         self.init_ui()
-        
+
+        # Local Manager publishes slot state to shared memory - read it
+        # directly and skip the slot topics on the broker.
+        self.board: Optional[OccupancyBoardReader] = None
+        self.board_seq: int = -1
+        if self.attach_board():
+            ic("Shared occupancy board attached.")
+        else:
+            ic("No live shared occupancy board found, using MQTT for slots.")
+
         # Init Background Worker
-        self.worker = MqttWorker()
+        self.worker = MqttWorker(subscribe_slots=self.board is None)
         self.worker.msg_signal.connect(self.update_dashboard)
 
+        # Keeps polling even on MQTT so a (re)started Manager is picked up
+        self.board_timer = QTimer()
+        self.board_timer.timeout.connect(self.poll_board)
+        self.board_timer.start(SHM_POLL_INTERVAL)
+
     def init_ui(self) -> None:
         main_widget = QWidget()
         main_layout = QVBoxLayout()
@@ -68,11 +94,15 @@ class ParkingDashboard(QMainWindow):
             
         main_layout.addLayout(grid_layout)
 
-        # 3. Live Logs
+        # 3. Live Logs / History (DB, loaded in the background)
         self.list_logs = QListWidget()
         self.list_logs.setStyleSheet("background-color: #2b2b2b; color: #00FF00; font-family: Consolas;")
-        main_layout.addWidget(QLabel("Live System Logs:"))
-        main_layout.addWidget(self.list_logs)
+        self.history_panel = HistoryPanel()
+
+        tabs = QTabWidget()
+        tabs.addTab(self.list_logs, "Live System Logs")
+        tabs.addTab(self.history_panel, "History")
+        main_layout.addWidget(tabs)
         
         main_widget.setLayout(main_layout)
         self.setCentralWidget(main_widget)
@@ -87,22 +117,13 @@ class ParkingDashboard(QMainWindow):
     def update_dashboard(self, topic: str, payload: str) -> None:
         """Parses incoming MQTT messages and updates the UI."""
         
-        # 1. Slot Status Updates
+        # 1. Slot Status Updates (the shared board wins while attached)
         if "Slots" in topic:
+            if self.board is not None:
+                return
             try:
                 slot_id = int(topic.split("/")[-2])
-                is_occupied = int(payload) == 1
-                
-                lbl = self.slot_widgets.get(slot_id)
-                if lbl:
-                    if is_occupied:
-                        lbl.setText(f"Slot {slot_id}\nOCCUPIED")
-                        lbl.setStyleSheet(self.get_style("OCCUPIED"))
-                        self.add_log(f"Sensor: Slot {slot_id} Occupied", "orange")
-                    else:
-                        lbl.setText(f"Slot {slot_id}\nFREE")
-                        lbl.setStyleSheet(self.get_style("FREE"))
-                        self.add_log(f"Sensor: Slot {slot_id} Freed", "green")
+                self.set_slot_state(slot_id, int(payload) == 1)
             except ValueError:
                 pass
 
@@ -115,6 +136,64 @@ class ParkingDashboard(QMainWindow):
             if payload == "OPEN":
                 self.add_log("GATE OPENING...", "cyan")
 
+    def set_slot_state(self, slot_id: int, is_occupied: bool) -> None:
+        lbl = self.slot_widgets.get(slot_id)
+        if lbl:
+            if is_occupied:
+                lbl.setText(f"Slot {slot_id}\nOCCUPIED")
+                lbl.setStyleSheet(self.get_style("OCCUPIED"))
+                self.add_log(f"Sensor: Slot {slot_id} Occupied", "orange")
+            else:
+                lbl.setText(f"Slot {slot_id}\nFREE")
+                lbl.setStyleSheet(self.get_style("FREE"))
+                self.add_log(f"Sensor: Slot {slot_id} Freed", "green")
+
+    def attach_board(self) -> bool:
+        """(Re)attaches to the shared board if a live Manager owns it."""
+        if self.board is not None:
+            self.board.close()
+            self.board = None
+        try:
+            board = OccupancyBoardReader()
+        except FileNotFoundError:
+            return False
+        if not board.writer_alive():
+            board.close()
+            return False
+        self.board = board
+        self.board_seq = -1
+        return True
+
+    def poll_board(self) -> None:
+        """Applies slot changes from the shared board (no MQTT round-trip)."""
+        if self.board is None:
+            if self.attach_board():
+                ic("Shared occupancy board attached.")
+            else:
+                return
+        elif not self.board.writer_alive():
+            # Manager restarted (segment replaced) or died - our mapping is orphaned
+            if not self.attach_board():
+                ic("Shared occupancy board lost, falling back to MQTT for slots.")
+                self.worker.subscribe_slot_topics()
+                return
+        snapshot = self.board.read()
+        if snapshot is None or snapshot[0] == self.board_seq or not snapshot[2]:
+            return  # Busy, unchanged, or Manager has no slot data yet
+        seq, _, slots = snapshot
+        self.board_seq = seq
+        for slot_id, status in slots.items():
+            lbl = self.slot_widgets.get(slot_id)
+            if lbl is None:
+                continue
+            was_occupied = "OCCUPIED" in lbl.text()
+            if was_occupied != bool(status):
+                self.set_slot_state(slot_id, bool(status))
+
+    def closeEvent(self, event) -> None:
+        self.history_panel.shutdown()
+        super().closeEvent(event)
+
     def add_log(self, text: str, color_name: str) -> None:
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
         item_text = f"[{timestamp}] {text}"
@@ -0,0 +1,185 @@
+# shared_state.py
+# ---------------------------------------------------------
+# Shared-Memory Occupancy Board
+# Lets co-located processes read the Manager's live slot state
+# without extra MQTT traffic (seqlock consistency protocol).
+# ---------------------------------------------------------
+import os
+import struct
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Optional
+from config import SHM_BOARD_NAME, SHM_HEARTBEAT_TIMEOUT
+from debug_log import ic
+
+# Segment layout (little-endian):
+#   [0:8]   sequence number (odd = write in progress)
+#   [8:16]  writer heartbeat (epoch seconds, float)
+#   [16:20] writer PID
+#   [20:24] total slots
+#   [24:28] occupied count
+#   [28:]   slot bitmap (bit i-1 set = slot i occupied)
+HEADER_FORMAT: str = "<QdIII"
+HEADER_SIZE: int = struct.calcsize(HEADER_FORMAT)
+SEQ_FORMAT: str = "<Q"
+OWNER_FORMAT: str = "<dI"
+OWNER_OFFSET: int = 8
+SNAPSHOT_FORMAT: str = "<II"
+SNAPSHOT_OFFSET: int = 20
+
+# Segments created by a writer in this process (see _attach_untracked)
+_created_here: set[str] = set()
+
+
+def _bitmap_size(total_slots: int) -> int:
+    return (total_slots + 7) // 8
+
+
+def _pid_alive(pid: int) -> bool:
+    if sys.platform == "win32":
+        return True  # os.kill(pid, 0) would terminate it - rely on the heartbeat
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _attach_untracked(name: str) -> shared_memory.SharedMemory:
+    """
+    Opens an existing segment without handing it to this process's resource
+    tracker, which would otherwise unlink it when this process exits.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    # The tracker keeps one entry per name: if a writer in this process
+    # created the segment, dropping the entry would break its unlink().
+    if name not in _created_here:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def _owner_alive(shm: shared_memory.SharedMemory) -> bool:
+    """True if the segment's writer is still running and heartbeating."""
+    heartbeat, pid = struct.unpack_from(OWNER_FORMAT, shm.buf, OWNER_OFFSET)
+    if pid == 0 or time.time() - heartbeat > SHM_HEARTBEAT_TIMEOUT:
+        return False
+    return _pid_alive(pid)
+
+
+class OccupancyBoardWriter:
+    """
+    Single writer side of the board (owned by ParkingManager).
+    Creates the segment and unlinks it on close. The board stays "unknown"
+    (zero slots) until the first publish(); start_heartbeat() keeps it
+    marked alive independently of the Manager's main loop.
+    """
+    def __init__(self, total_slots: int, name: str = SHM_BOARD_NAME):
+        self.total_slots: int = total_slots
+        size = HEADER_SIZE + _bitmap_size(total_slots)
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Probe untracked: a refused process must not unlink a live board on exit
+            self.shm = _attach_untracked(name)
+            if self.shm.size >= HEADER_SIZE and _owner_alive(self.shm):
+                pid = struct.unpack_from(OWNER_FORMAT, self.shm.buf, OWNER_OFFSET)[1]
+                self.shm.close()
+                raise RuntimeError(f"Shared board '{name}' is owned by a running Manager (PID {pid})")
+            # Stale segment left behind by a crashed Manager - adopt it
+            ic(f"Reusing stale shared board: {name}")
+            if self.shm.size < size:
+                self.shm.close()
+                self.shm.unlink()
+                self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            else:
+                from multiprocessing import resource_tracker
+                resource_tracker.register(self.shm._name, "shared_memory")
+        _created_here.add(name)
+        self.name: str = name
+        self.seq: int = struct.unpack_from(SEQ_FORMAT, self.shm.buf, 0)[0] & ~1
+        self._stop_heartbeat = threading.Event()
+        self.heartbeat()
+        # Hide any snapshot left by a previous Manager until real data is published
+        self._write(0, 0, b"")
+
+    def heartbeat(self) -> None:
+        struct.pack_into(OWNER_FORMAT, self.shm.buf, OWNER_OFFSET, time.time(), os.getpid())
+
+    def start_heartbeat(self, interval: float = 1.0) -> None:
+        """Refreshes the heartbeat from a daemon thread until close()."""
+        def beat() -> None:
+            while not self._stop_heartbeat.wait(interval):
+                self.heartbeat()
+        threading.Thread(target=beat, name="Board_Heartbeat", daemon=True).start()
+
+    def publish(self, slots_status: dict[int, int], occupied_count: int) -> None:
+        """Writes a new snapshot, bracketed by odd/even sequence updates."""
+        bitmap = bytearray(_bitmap_size(self.total_slots))
+        for slot_id, status in slots_status.items():
+            if status and 1 <= slot_id <= self.total_slots:
+                bitmap[(slot_id - 1) // 8] |= 1 << ((slot_id - 1) % 8)
+        self._write(self.total_slots, occupied_count, bitmap)
+        self.heartbeat()
+
+    def _write(self, total_slots: int, occupied_count: int, bitmap: bytes) -> None:
+        buf = self.shm.buf
+        self.seq += 1  # Odd: readers will retry
+        struct.pack_into(SEQ_FORMAT, buf, 0, self.seq)
+        struct.pack_into(SNAPSHOT_FORMAT, buf, SNAPSHOT_OFFSET, total_slots, occupied_count)
+        buf[HEADER_SIZE:HEADER_SIZE + len(bitmap)] = bitmap
+        self.seq += 1  # Even: snapshot is consistent
+        struct.pack_into(SEQ_FORMAT, buf, 0, self.seq)
+
+    def close(self) -> None:
+        self._stop_heartbeat.set()
+        # Mark the board dead first so attached readers re-attach or fall back
+        struct.pack_into(OWNER_FORMAT, self.shm.buf, OWNER_OFFSET, 0.0, 0)
+        self.shm.close()
+        _created_here.discard(self.name)
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class OccupancyBoardReader:
+    """
+    Read-only view of the board for local consumers (Dashboard, tools).
+    Never unlinks the segment - the Manager owns its lifetime. A Manager
+    restart replaces the segment, so check writer_alive() and re-attach.
+    """
+    def __init__(self, name: str = SHM_BOARD_NAME):
+        self.shm = _attach_untracked(name)
+
+    def writer_alive(self) -> bool:
+        return self.shm.size >= HEADER_SIZE and _owner_alive(self.shm)
+
+    def read(self, max_retries: int = 100) -> Optional[tuple[int, int, dict[int, int]]]:
+        """
+        Returns (sequence, occupied_count, slots_status) from a consistent
+        snapshot, or None if the writer kept the board busy for every retry.
+        slots_status is empty while the Manager has not published real data.
+        """
+        buf = self.shm.buf
+        for _ in range(max_retries):
+            seq_before = struct.unpack_from(SEQ_FORMAT, buf, 0)[0]
+            if seq_before & 1:
+                time.sleep(0)  # Writer mid-update, yield and retry
+                continue
+            total_slots, occupied = struct.unpack_from(SNAPSHOT_FORMAT, buf, SNAPSHOT_OFFSET)
+            bitmap = bytes(buf[HEADER_SIZE:HEADER_SIZE + _bitmap_size(total_slots)])
+            if struct.unpack_from(SEQ_FORMAT, buf, 0)[0] == seq_before:
+                slots = {i: (bitmap[(i - 1) // 8] >> ((i - 1) % 8)) & 1
+                         for i in range(1, total_slots + 1)}
+                return seq_before, occupied, slots
+        return None
+
+    def close(self) -> None:
+        self.shm.close()
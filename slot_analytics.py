@@ -0,0 +1,157 @@
+# slot_analytics.py
+# ---------------------------------------------------------
+# Slot Usage Analytics (Dwell Time, Turnover, Peak Hours)
+# Loads slot transitions in chunks and aggregates them with
+# vectorized NumPy/pandas operations. Results are cached and
+# updated incrementally as new transitions arrive.
+# ---------------------------------------------------------
+import sqlite3
+from typing import Optional
+import numpy as np
+import pandas as pd
+from config import DB_NAME, TABLE_SLOT_EVENTS, ANALYTICS_CHUNK_SIZE, TIMEZONE, TOTAL_SLOTS
+from icecream import ic
+
+SECONDS_PER_DAY: int = 86400
+
+
+class SlotAnalytics:
+    """
+    Incremental analytics over the slot events table.
+    Call refresh() to pull only rows newer than the last one seen.
+    """
+    def __init__(self, db_name: str = DB_NAME, chunk_size: int = ANALYTICS_CHUNK_SIZE,
+                 tz: str = TIMEZONE, total_slots: int = TOTAL_SLOTS):
+        self.db_name: str = db_name
+        self.chunk_size: int = chunk_size
+        self.tz: str = tz  # IANA name, so DST is applied per timestamp
+        self.total_slots: int = total_slots
+
+        # Incremental cache
+        self.last_id: int = 0
+        # Last event per slot; "since" = ts of the arrival that opened its occupied run
+        self._tail = pd.DataFrame({"id": [], "slot_id": [], "state": [], "ts": [], "since": []}, dtype=np.int64)
+        self._dwell_parts: list[pd.DataFrame] = []
+        self._arrivals_per_slot = pd.Series(dtype=np.int64)
+        self._arrivals_per_hour = np.zeros(24, dtype=np.int64)
+        self._days_seen: set[pd.Timestamp] = set()
+        self.first_ts: Optional[int] = None
+        self.last_ts: Optional[int] = None
+
+    def refresh(self) -> int:
+        """Loads new transitions and updates the cache. Returns rows read."""
+        sql = f''' SELECT id, slot_id, state, ts FROM {TABLE_SLOT_EVENTS}
+                   WHERE id > ? ORDER BY id '''
+        rows = 0
+        try:
+            conn = sqlite3.connect(f"file:{self.db_name}?mode=ro", uri=True)
+        except sqlite3.Error as e:
+            ic(f"Analytics DB Error: {e}")
+            return 0
+        try:
+            for chunk in pd.read_sql_query(sql, conn, params=(self.last_id,),
+                                           chunksize=self.chunk_size, dtype=np.int64):
+                self._process_chunk(chunk)
+                rows += len(chunk)
+        except (sqlite3.Error, pd.errors.DatabaseError) as e:
+            ic(f"Analytics Query Error: {e}")
+        finally:
+            conn.close()
+        return rows
+
+    def _process_chunk(self, chunk: pd.DataFrame) -> None:
+        if chunk.empty:
+            return
+
+        # Prepend the last known event of each slot so dwell periods that
+        # straddle chunk (or refresh) boundaries are still closed correctly.
+        df = pd.concat([self._tail.assign(is_new=False), chunk.assign(is_new=True)], ignore_index=True)
+        df = df.sort_values(["slot_id", "id"], kind="stable", ignore_index=True)
+
+        slot = df["slot_id"].to_numpy()
+        state = df["state"].to_numpy()
+        ts = df["ts"].to_numpy()
+        is_new = df["is_new"].to_numpy()
+
+        # Arrivals = real free -> occupied transitions (a repeated "occupied",
+        # e.g. after a Manager restart, continues the current stay)
+        new_slot_or_free = np.ones(len(df), dtype=bool)
+        new_slot_or_free[1:] = (slot[1:] != slot[:-1]) | (state[:-1] != 1)
+        opens_stay = (state == 1) & new_slot_or_free
+        is_arrival = is_new & opens_stay
+
+        # Carry each stay's arrival time forward through its occupied rows
+        since = np.where(is_new & opens_stay, ts, np.nan)
+        since[~is_new] = df["since"].to_numpy(dtype=float)[~is_new]
+        since = pd.Series(since).groupby(slot).ffill().to_numpy()
+        df["since"] = np.nan_to_num(since, nan=0).astype(np.int64)
+
+        # Dwell = occupied run closed by a free event on the same slot
+        closed = np.zeros(len(df), dtype=bool)
+        closed[:-1] = (slot[:-1] == slot[1:]) & (state[:-1] == 1) & (state[1:] == 0)
+        dwell_idx = np.flatnonzero(closed)
+        if dwell_idx.size:
+            start = df["since"].to_numpy()[dwell_idx]
+            self._dwell_parts.append(pd.DataFrame({
+                "slot_id": slot[dwell_idx],
+                "start_ts": start,
+                "dwell_s": ts[dwell_idx + 1] - start,
+            }))
+
+        local = pd.DatetimeIndex(pd.to_datetime(ts[is_new], unit="s", utc=True)).tz_convert(self.tz)
+        self._arrivals_per_hour += np.bincount(local.hour[is_arrival[is_new]], minlength=24)
+        self._arrivals_per_slot = self._arrivals_per_slot.add(
+            pd.Series(slot[is_arrival]).value_counts(), fill_value=0).astype(np.int64)
+
+        self._days_seen.update(local.normalize().unique())
+        chunk_min, chunk_max = int(chunk["ts"].min()), int(chunk["ts"].max())
+        self.first_ts = chunk_min if self.first_ts is None else min(self.first_ts, chunk_min)
+        self.last_ts = chunk_max if self.last_ts is None else max(self.last_ts, chunk_max)
+
+        self._tail = df.groupby("slot_id", sort=False).tail(1).drop(columns="is_new")
+        self.last_id = int(chunk["id"].max())
+
+    # --- Results ---
+    def dwell_times(self) -> pd.DataFrame:
+        """All completed parking sessions: slot_id, start_ts, dwell_s."""
+        if not self._dwell_parts:
+            return pd.DataFrame({"slot_id": [], "start_ts": [], "dwell_s": []}, dtype=np.int64)
+        if len(self._dwell_parts) > 1:
+            self._dwell_parts = [pd.concat(self._dwell_parts, ignore_index=True)]
+        return self._dwell_parts[0]
+
+    def dwell_distribution(self) -> pd.DataFrame:
+        """Per-slot dwell statistics in seconds (count, mean, median, p90, max)."""
+        grouped = self.dwell_times().groupby("slot_id")["dwell_s"]
+        return pd.DataFrame({
+            "count": grouped.count(),
+            "mean": grouped.mean(),
+            "median": grouped.median(),
+            "p90": grouped.quantile(0.9),
+            "max": grouped.max(),
+        })
+
+    def turnover_rate(self) -> pd.Series:
+        """Arrivals per slot per day over the observed time span (min. one day)."""
+        span = 0 if self.first_ts is None else self.last_ts - self.first_ts
+        days = max(span / SECONDS_PER_DAY, 1.0)
+        slot_ids = sorted(set(range(1, self.total_slots + 1)) | set(self._tail["slot_id"].tolist()))
+        arrivals = self._arrivals_per_slot.reindex(slot_ids, fill_value=0)
+        return (arrivals / days).rename_axis("slot_id").rename("arrivals_per_day")
+
+    def peak_hour_curve(self) -> pd.Series:
+        """Average arrivals per local hour of day (0-23) across observed calendar days."""
+        days = max(len(self._days_seen), 1)
+        return pd.Series(self._arrivals_per_hour / days, index=pd.RangeIndex(24, name="hour"),
+                         name="arrivals")
+
+
+if __name__ == "__main__":
+    analytics = SlotAnalytics()
+    ic(f"Loaded {analytics.refresh()} slot transitions.")
+    print("\nDwell Time Distribution (seconds):")
+    print(analytics.dwell_distribution())
+    print("\nTurnover Rate:")
+    print(analytics.turnover_rate())
+    print("\nPeak Hour Curve:")
+    print(analytics.peak_hour_curve())
@@ -0,0 +1,88 @@
+# startup_benchmark.py
+# ---------------------------------------------------------
+# Controller Startup Benchmark
+# Measures cold-start phases of the headless ParkingManager in
+# fresh interpreters and checks it stays free of GUI/analytics
+# dependencies. Usage: python startup_benchmark.py [--runs N] [--connect]
+# ---------------------------------------------------------
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Modules the headless controller must never pull in
+FORBIDDEN_MODULES: tuple[str, ...] = ("PyQt5", "pandas", "numpy")
+# Loaded on first use only, so they must be absent right after import
+LAZY_MODULES: tuple[str, ...] = ("icecream",)
+
+# Executed in a fresh interpreter per run so import caches are cold
+PROBE: str = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from logic_controller import ParkingManager
+t1 = time.perf_counter()
+eager = sorted(m for m in {lazy} if m in sys.modules)
+manager = ParkingManager()
+t2 = time.perf_counter()
+manager.boot(connect={connect})
+t3 = time.perf_counter()
+if {connect}:
+    manager.mqtt.disconnect()
+manager.board.close()
+print(json.dumps({{
+    "import_ms": (t1 - t0) * 1000,
+    "construct_ms": (t2 - t1) * 1000,
+    "boot_ms": (t3 - t2) * 1000,
+    "total_ms": (t3 - t0) * 1000,
+    "loaded": sorted(m for m in {forbidden} if m in sys.modules),
+    "eager": eager,
+}}))
+"""
+
+
+def run_once(connect: bool) -> dict:
+    code = PROBE.format(connect=connect, forbidden=FORBIDDEN_MODULES, lazy=LAZY_MODULES)
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        # Throwaway DB and board so the benchmark never touches a live lot
+        env = dict(os.environ,
+                   PYTHONPATH=os.pathsep.join(filter(None, [here, os.environ.get("PYTHONPATH")])),
+                   PARKING_DB_NAME=os.path.join(tmp, "bench.db"),
+                   PARKING_SHM_BOARD_NAME=f"bench_board_{os.getpid()}")
+        result = subprocess.run([sys.executable, "-c", code], cwd=tmp, env=env,
+                                capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Parking Manager startup.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--connect", action="store_true",
+                        help="Include the broker connect (needs network).")
+    args = parser.parse_args()
+
+    samples = [run_once(args.connect) for _ in range(args.runs)]
+
+    print(f"Parking Manager startup over {args.runs} runs (connect={args.connect}):")
+    for phase in ("import_ms", "construct_ms", "boot_ms", "total_ms"):
+        values = [s[phase] for s in samples]
+        print(f"  {phase:<13} median {statistics.median(values):8.1f}  "
+              f"min {min(values):8.1f}  max {max(values):8.1f}")
+
+    loaded = sorted({m for s in samples for m in s["loaded"]})
+    eager = sorted({m for s in samples for m in s["eager"]})
+    if loaded:
+        print(f"FAIL: headless controller imported {', '.join(loaded)}")
+    if eager:
+        print(f"FAIL: {', '.join(eager)} imported eagerly by logic_controller")
+    if loaded or eager:
+        sys.exit(1)
+    print(f"OK: no {', '.join(FORBIDDEN_MODULES)} imports; "
+          f"{', '.join(LAZY_MODULES)} deferred past import.")
+
+
+if __name__ == "__main__":
+    main()